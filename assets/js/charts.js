@@ -252,6 +252,15 @@ function showIntelDetail(e) {
             </button>
         </div>
     `;
+
+    // Formato compatto: la descrizione lunga arriva dal file di dettaglio
+    if (e.description === null && e.id && window.loadEventDetails) {
+        container.dataset.eventId = e.id;
+        window.loadEventDetails(e.id).then(d => {
+            const p = container.querySelector('.d-body p');
+            if (p && d.description && container.dataset.eventId === e.id) p.innerText = d.description;
+        });
+    }
 }
 
 // Funzioni Standard Grafici (Timeline, Type, Radar) - Invariate
@@ -46,12 +46,51 @@ let initMap = function() {
     map.addLayer(eventsLayer);
 };
 
+// --- FORMATO COMPATTO (scritto dal sink geojson insieme a events.geojson) ---
+const COMPACT_EVENTS_URL = 'assets/data/events.compact.json';
+const EVENT_DETAILS_URL = 'assets/data/events.details.json';
+let eventDetailsPromise = null;
+
+// Ricostruisce la FeatureCollection: coordinate intere in delta, campi
+// categorici come indici nella tabella "dict", proprietà come array posizionali.
+window.decodeCompactEvents = function(doc) {
+  const scale = Math.pow(10, doc.precision);
+  let lon = 0, lat = 0;
+  const features = doc.props.map((row, i) => {
+    lon += doc.coords[2 * i];
+    lat += doc.coords[2 * i + 1];
+    const props = { id: doc.ids[i] };
+    doc.fields.forEach((key, k) => {
+      const dict = doc.dict[key];
+      props[key] = dict ? dict[row[k]] : row[k];
+    });
+    return { type: 'Feature', geometry: { type: 'Point', coordinates: [lon / scale, lat / scale] }, properties: props };
+  });
+  return { type: 'FeatureCollection', features: features };
+};
+
+// Descrizioni lunghe (description === null): file scaricato una volta sola, al primo dettaglio aperto
+window.loadEventDetails = async function(id) {
+  if (!eventDetailsPromise) {
+    eventDetailsPromise = fetch(EVENT_DETAILS_URL).then(r => r.ok ? r.json() : {}).catch(() => ({}));
+  }
+  const details = await eventDetailsPromise;
+  return details[id] || {};
+};
+
 // --- CARICAMENTO DATI ---
 async function loadEventsData() {
   try {
-    const res = await fetch('assets/data/events.geojson');
-    if(!res.ok) throw new Error("Errore fetch GeoJSON");
-    const data = await res.json();
+    // Prima il profilo compatto, se non è stato generato si usa il GeoJSON completo
+    let data;
+    const compactRes = await fetch(COMPACT_EVENTS_URL).catch(() => null);
+    if (compactRes && compactRes.ok) {
+      data = window.decodeCompactEvents(await compactRes.json());
+    } else {
+      const res = await fetch('assets/data/events.geojson');
+      if(!res.ok) throw new Error("Errore fetch GeoJSON");
+      data = await res.json();
+    }
     
     // MAPPING CON MOMENT.JS
     window.globalEvents = data.features.map(f => {
@@ -216,7 +255,15 @@ window.openModal = function(eventJson) {
   const e = JSON.parse(decodeURIComponent(eventJson));
   
   document.getElementById('modalTitle').innerText = e.title;
-  document.getElementById('modalDesc').innerText = e.description || "Nessun dettaglio.";
+  const descEl = document.getElementById('modalDesc');
+  descEl.innerText = e.description || "Nessun dettaglio.";
+  if (e.description === null && e.id) {
+    descEl.innerText = "Caricamento...";
+    descEl.dataset.eventId = e.id;
+    window.loadEventDetails(e.id).then(d => {
+      if (descEl.dataset.eventId === e.id) descEl.innerText = d.description || "Nessun dettaglio.";
+    });
+  }
   document.getElementById('modalType').innerText = e.type;
   document.getElementById('modalDate').innerText = e.date;
   
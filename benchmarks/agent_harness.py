@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+# Gli agenti leggono le chiavi all'import: in offline bastano valori finti
+for var in ('TELEGRAM_API_ID', 'TELEGRAM_API_HASH', 'OPENAI_API_KEY2'):
+    os.environ.setdefault(var, 'offline')
+
+import osint_agent
+import ai_agent
+import nitter_pool
+from fake_services import (Metrics, ServiceProfile, make_telegram_client, make_nitter,
+                           FakeOpenAI, FakeTavily, FakeSheetsClient)
+from synthetic_events import HEADERS, generate_rows
+
+# ==========================================
+# 🚦 HARNESS END-TO-END OFFLINE
+# ==========================================
+# Esegue osint_agent.main e ai_agent.main contro i servizi finti e riporta
+# throughput, latenze di coda e token (con costo equivalente gpt-4o-mini).
+# Uso:
+#   python benchmarks/agent_harness.py --channels 300 --accounts 150 --sheet-rows 2000
+#   python benchmarks/agent_harness.py --profile openai=400,0.02,20 --profile nitter=800,0.3
+#   python benchmarks/agent_harness.py --only osint_agent --daemon 60
+
+# service: (latency_ms, error_rate, rate_limit/s)
+DEFAULT_PROFILES = {
+    'telegram': (80, 0.01, None),
+    'nitter': (250, 0.10, None),
+    'openai': (150, 0.01, 50),
+    'tavily': (200, 0.02, None),
+    'sheets': (100, 0.0, None),
+}
+
+def parse_profiles(specs):
+    profiles = dict(DEFAULT_PROFILES)
+    for spec in specs or []:
+        name, _, values = spec.partition('=')
+        parts = (values.split(',') + ['', '', ''])[:3]
+        base = profiles[name]
+        profiles[name] = (
+            float(parts[0]) if parts[0] else base[0],
+            float(parts[1]) if parts[1] else base[1],
+            float(parts[2]) if parts[2] else base[2],
+        )
+    return {name: ServiceProfile(latency_ms=lat, jitter_ms=lat / 3, error_rate=err, rate_limit=rl)
+            for name, (lat, err, rl) in profiles.items()}
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[int(q * (len(ordered) - 1))], 1)
+
+def setup_osint_agent(args, profiles, metrics, workdir):
+    osint_agent.TelegramClient = make_telegram_client(profiles['telegram'], metrics, args.seed)
+    osint_agent.Nitter = make_nitter(profiles['nitter'], metrics, args.seed)
+    osint_agent.client_ai = FakeOpenAI(profiles['openai'], metrics, args.seed)
+    osint_agent.TELEGRAM_CHANNELS = [f"channel_{i}" for i in range(args.channels)]
+    osint_agent.TWITTER_ACCOUNTS = [f"account_{i}" for i in range(args.accounts)]
+    osint_agent.DATA_FILE = os.path.join(workdir, 'events.geojson')
+    nitter_pool.NITTER_HEALTH_FILE = os.path.join(workdir, 'nitter_health.json')
+
+def run_osint_agent(args, profiles, metrics, workdir):
+    setup_osint_agent(args, profiles, metrics, workdir)
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(osint_agent.main())
+    elapsed = time.perf_counter() - t0
+
+    events = 0
+    if os.path.exists(osint_agent.DATA_FILE):
+        with open(osint_agent.DATA_FILE, 'r', encoding='utf-8') as f:
+            events = len(json.load(f)['features'])
+    return {"wall_s": round(elapsed, 2), "events": events,
+            "events_per_s": round(events / elapsed, 2) if elapsed else None}
+
+def run_osint_daemon(args, profiles, metrics, workdir):
+    """Daemon per `args.daemon` secondi, con intervalli compressi da minuti a secondi."""
+    setup_osint_agent(args, profiles, metrics, workdir)
+    osint_agent.DAEMON_MIN_INTERVAL_S = 1
+    osint_agent.DAEMON_START_INTERVAL_S = 4
+    osint_agent.DAEMON_MAX_INTERVAL_S = 30
+    osint_agent.FLUSH_INTERVAL_S = 2
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = asyncio.run(osint_agent.run_daemon(max_runtime_s=args.daemon))
+    elapsed = time.perf_counter() - t0
+
+    with open(osint_agent.DATA_FILE, 'r', encoding='utf-8') as f:
+        events = len(json.load(f)['features'])
+    intervals = sorted(s['interval'] for s in sources)
+    return {"wall_s": round(elapsed, 2), "events": events,
+            "events_per_s": round(events / elapsed, 2) if elapsed else None,
+            "interval_min_s": round(intervals[0], 1) if intervals else None,
+            "interval_median_s": round(intervals[len(intervals) // 2], 1) if intervals else None,
+            "interval_max_s": round(intervals[-1], 1) if intervals else None}
+
+def run_ai_agent(args, profiles, metrics):
+    rows = list(generate_rows(args.sheet_rows, args.seed))
+    for row in rows[::2]:
+        row['Verification'] = "" # metà da verificare
+    sheets = FakeSheetsClient(profiles['sheets'], metrics, HEADERS, rows, args.seed)
+    tavily = FakeTavily(profiles['tavily'], metrics, args.seed)
+    openai = FakeOpenAI(profiles['openai'], metrics, args.seed)
+
+    ai_agent.setup_clients = lambda: (sheets, tavily, openai)
+    ai_agent.BATCH_SIZE = args.sheet_batch
+    # Le pause "gentili" non misurano i servizi: le contiamo senza dormire.
+    # ai_agent ne fa esattamente una a fine di ogni riga, quindi il loro numero
+    # è anche il numero di righe arrivate in fondo all'analisi.
+    politeness = []
+    ai_agent.time = SimpleNamespace(sleep=politeness.append)
+
+    t0 = time.perf_counter()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            ai_agent.main()
+        except Exception as e:
+            error = str(e)
+    elapsed = time.perf_counter() - t0
+
+    processed = len(politeness)
+    return {"wall_s": round(elapsed, 2), "rows_processed": processed,
+            "rows_per_s": round(processed / elapsed, 2) if elapsed else None,
+            "skipped_sleep_s": sum(politeness), "error": error}
+
+def build_report(metrics, runs):
+    services = {}
+    for name, s in metrics.services.items():
+        services[name] = {
+            "calls": s["calls"], "errors": s["errors"], "rate_limited": s["rate_limited"],
+            "p50_ms": percentile(s["latencies"], 0.50), "p95_ms": percentile(s["latencies"], 0.95),
+            "p99_ms": percentile(s["latencies"], 0.99), "max_ms": percentile(s["latencies"], 1.0),
+        }
+    return {
+        "runs": runs,
+        "services": services,
+        "tokens": {"prompt": metrics.prompt_tokens, "completion": metrics.completion_tokens,
+                   "cost_usd": round(metrics.cost_usd(), 4)},
+    }
+
+def print_report(report):
+    print("\n=== HARNESS REPORT ===")
+    for name, run in report['runs'].items():
+        print(f"🏃 {name}: {run}")
+    print(f"{'servizio':<10} {'chiamate':>8} {'errori':>7} {'429':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, s in report['services'].items():
+        print(f"{name:<10} {s['calls']:>8} {s['errors']:>7} {s['rate_limited']:>5} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+    t = report['tokens']
+    print(f"🪙 Token: {t['prompt']} in / {t['completion']} out ≈ ${t['cost_usd']}")
+    print("======================")
+
+def main():
+    parser = argparse.ArgumentParser(description="Harness offline per gli agenti OSINT")
+    parser.add_argument('--channels', type=int, default=200, help="Canali Telegram finti")
+    parser.add_argument('--accounts', type=int, default=100, help="Account X finti")
+    parser.add_argument('--sheet-rows', type=int, default=1000, help="Righe dello Sheet finto")
+    parser.add_argument('--sheet-batch', type=int, default=ai_agent.BATCH_SIZE, help="BATCH_SIZE per ai_agent")
+    parser.add_argument('--profile', action='append', help="servizio=latenza_ms,error_rate,rate_limit")
+    parser.add_argument('--only', choices=['osint_agent', 'ai_agent'], help="Esegue un solo agente")
+    parser.add_argument('--daemon', type=float, help="Esegue osint_agent in modalità daemon per N secondi")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Salva il report JSON")
+    args = parser.parse_args()
+
+    profiles = parse_profiles(args.profile)
+    metrics = Metrics()
+    runs = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.only in (None, 'osint_agent'):
+            if args.daemon:
+                runs['osint_daemon'] = run_osint_daemon(args, profiles, metrics, workdir)
+            else:
+                runs['osint_agent'] = run_osint_agent(args, profiles, metrics, workdir)
+        if args.only in (None, 'ai_agent'):
+            runs['ai_agent'] = run_ai_agent(args, profiles, metrics)
+
+    report = build_report(metrics, runs)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report salvato in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+# ==========================================
+# 🎭 SERVIZI FINTI (Telegram, Nitter, OpenAI, Tavily, Google Sheets)
+# ==========================================
+# Sostituti locali dei client usati da osint_agent.py e ai_agent.py, con
+# latenza, tasso di errore e rate limit configurabili. Ogni chiamata viene
+# registrata in Metrics per il report dell'harness.
+
+# Prezzi gpt-4o-mini (USD per 1M token) per stimare il costo equivalente
+PRICE_INPUT_PER_M = 0.15
+PRICE_OUTPUT_PER_M = 0.60
+
+class FakeServiceError(Exception):
+    pass
+
+class FakeRateLimitError(FakeServiceError):
+    pass
+
+class Metrics:
+    """Contatori condivisi: chiamate, errori, latenze (ms) e token per servizio."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.services = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _service(self, name):
+        return self.services.setdefault(name, {"calls": 0, "errors": 0, "rate_limited": 0, "latencies": []})
+
+    def record(self, name, latency_ms, error=None):
+        with self._lock:
+            s = self._service(name)
+            s["calls"] += 1
+            s["latencies"].append(latency_ms)
+            if isinstance(error, FakeRateLimitError):
+                s["rate_limited"] += 1
+            elif error is not None:
+                s["errors"] += 1
+
+    def add_tokens(self, prompt, completion):
+        with self._lock:
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+
+    def cost_usd(self):
+        return (self.prompt_tokens * PRICE_INPUT_PER_M + self.completion_tokens * PRICE_OUTPUT_PER_M) / 1e6
+
+class ServiceProfile:
+    """
+    Comportamento di un servizio finto.
+    latency_ms: latenza base; jitter_ms: media della coda esponenziale aggiunta;
+    error_rate: probabilità di errore; rate_limit: max chiamate/secondo (None = illimitato).
+    """
+
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, rate_limit=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+
+class _FakeService:
+    def __init__(self, name, profile, metrics, seed=0):
+        self.name = name
+        self.profile = profile
+        self.metrics = metrics
+        self._rng = random.Random(f"{name}-{seed}")
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_calls = 0
+
+    def _plan(self):
+        """Decide latenza ed eventuale errore della prossima chiamata."""
+        p = self.profile
+        with self._lock:
+            latency = p.latency_ms + (self._rng.expovariate(1 / p.jitter_ms) if p.jitter_ms else 0)
+            error = None
+            if p.rate_limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_calls = now, 0
+                self._window_calls += 1
+                if self._window_calls > p.rate_limit:
+                    error = FakeRateLimitError(f"{self.name}: 429 Too Many Requests")
+            if error is None and self._rng.random() < p.error_rate:
+                error = FakeServiceError(f"{self.name}: 503 Service Unavailable")
+        return latency, error
+
+    def call(self):
+        latency, error = self._plan()
+        time.sleep(latency / 1000)
+        self.metrics.record(self.name, latency, error)
+        if error: raise error
+
+    async def acall(self):
+        latency, error = self._plan()
+        await asyncio.sleep(latency / 1000)
+        self.metrics.record(self.name, latency, error)
+        if error: raise error
+
+def _fake_text(rng, source, n):
+    places = ["Kharkiv", "Kupiansk", "Pokrovsk", "Belgorod", "Odesa", "Sevastopol", "Zaporizhzhia"]
+    weapons = ["Shahed", "Iskander", "FAB-500", "HIMARS", "Storm Shadow", "Magura"]
+    return (f"[{source} #{n}] Reports of a {rng.choice(weapons)} strike near {rng.choice(places)}. "
+            f"Local authorities confirm damage to infrastructure, details to follow. " * rng.randint(1, 3))
+
+# --- TELEGRAM (telethon.TelegramClient) ---
+
+def make_telegram_client(profile, metrics, seed=0, messages_per_channel=20):
+    """
+    Telegram finto: ogni canale ha già `messages_per_channel` messaggi e ne
+    riceve di nuovi nel tempo con un ritmo suo (molti canali fermi, pochi attivi).
+    """
+    service = _FakeService("telegram", profile, metrics, seed)
+    started = time.monotonic()
+
+    def latest_id(channel):
+        rate = random.Random(f"rate-{channel}-{seed}").choice([0.0, 0.0, 0.0, 0.02, 0.2]) # msg/s
+        return messages_per_channel + int((time.monotonic() - started) * rate)
+
+    class FakeTelegramClient:
+        def __init__(self, session, api_id, api_hash):
+            self.session = session
+
+        async def __aenter__(self):
+            await service.acall() # connessione
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def iter_messages(self, channel, limit=None, min_id=0):
+            await service.acall()
+            for msg_id in range(latest_id(channel), min_id, -1)[:limit]:
+                rng = random.Random(f"tg-{channel}-{msg_id}-{seed}")
+                yield SimpleNamespace(id=msg_id, text=_fake_text(rng, channel, msg_id))
+
+    return FakeTelegramClient
+
+# --- NITTER (ntscraper.Nitter) ---
+
+def make_nitter(profile, metrics, seed=0, instances=8):
+    """
+    Nitter finto con più istanze di qualità diversa: latenza crescente con
+    l'indice e un'istanza su quattro irraggiungibile. Un account su cinque è
+    fermo e non ha tweet recenti.
+    """
+    urls = [f"https://nitter-{i}.example" for i in range(instances)]
+    services = {}
+    for i, url in enumerate(urls):
+        inst_profile = ServiceProfile(
+            latency_ms=profile.latency_ms * (0.5 + 0.5 * i),
+            jitter_ms=profile.jitter_ms,
+            error_rate=1.0 if i % 4 == 3 else profile.error_rate,
+            rate_limit=profile.rate_limit,
+        )
+        services[url] = _FakeService("nitter", inst_profile, metrics, f"{seed}-{i}")
+
+    class FakeNitter:
+        def __init__(self, instances=None, log_level=1, skip_instance_check=False):
+            self.instances = list(instances or urls)
+            self.working_instances = list(self.instances)
+            if not skip_instance_check:
+                # Probe di tutte le istanze all'avvio, come ntscraper
+                self.working_instances = []
+                for url in self.instances:
+                    try:
+                        services[url].call()
+                        self.working_instances.append(url)
+                    except FakeServiceError:
+                        pass
+
+        def get_tweets(self, user, mode='user', number=3, instance=None, max_retries=5):
+            url = instance or random.choice(self.working_instances)
+            try:
+                services[url].call()
+            except FakeServiceError:
+                # Come ntscraper: istanza giù o limitata = risultato vuoto, nessuna eccezione
+                return {"tweets": [], "threads": []}
+            rng = random.Random(f"tw-{user}-{seed}")
+            if rng.random() < 0.2:
+                return {"tweets": [], "threads": []}
+            return {"tweets": [{
+                "text": _fake_text(rng, user, i),
+                "link": f"https://x.com/{user}/status/{10**6 + i}",
+                "pictures": [f"https://pbs.example/{user}_{i}.jpg"] if rng.random() < 0.3 else [],
+            } for i in range(number)]}
+
+    return FakeNitter
+
+# --- OPENAI (openai.OpenAI) ---
+
+def _count_tokens(text):
+    # Stima grezza: ~4 caratteri per token
+    return max(1, len(text) // 4)
+
+class FakeOpenAI:
+    def __init__(self, profile, metrics, seed=0):
+        self._service = _FakeService("openai", profile, metrics, seed)
+        self._metrics = metrics
+        self._rng = random.Random(f"openai-{seed}")
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model=None, messages=(), temperature=None, response_format=None, **kwargs):
+        self._service.call()
+        prompt = "".join(m["content"] for m in messages)
+        rng = self._rng
+        if response_format:
+            # ai_agent.analyze_event_pro
+            payload = {
+                "match": rng.random() < 0.8,
+                "confidence": rng.randint(60, 99),
+                "new_title": "Attacco con droni contro infrastrutture energetiche",
+                "new_type": rng.choice(["Drone Strike", "Missile Strike", "Artillery"]),
+                "description_it": "Riassunto sintetico dell'evento generato offline.",
+                "video_url": None,
+                "intensity": round(rng.uniform(0.1, 1.0), 1),
+                "best_link": "https://example.org/news",
+            }
+        else:
+            # osint_agent.analyze_with_ai
+            payload = {
+                "title": "Attacco segnalato",
+                "description": "Riassunto sintetico dell'evento generato offline.",
+                "lat": round(rng.uniform(44, 52), 4),
+                "lon": round(rng.uniform(22, 40), 4),
+                "type": rng.choice(["drone", "missile", "artillery"]),
+                "intensity": round(rng.uniform(0.1, 1.0), 1),
+                "actor_code": rng.choice(["RUS", "UKR", "UNK"]),
+                "confidence": rng.randint(50, 99),
+            }
+        content = json.dumps(payload, ensure_ascii=False)
+        usage = SimpleNamespace(prompt_tokens=_count_tokens(prompt), completion_tokens=_count_tokens(content))
+        self._metrics.add_tokens(usage.prompt_tokens, usage.completion_tokens)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+# --- TAVILY (tavily.TavilyClient) ---
+
+class FakeTavily:
+    def __init__(self, profile, metrics, seed=0):
+        self._service = _FakeService("tavily", profile, metrics, seed)
+        self._rng = random.Random(f"tavily-{seed}")
+
+    def search(self, query, search_depth="basic", include_images=False, max_results=5):
+        self._service.call()
+        return {"results": [{
+            "content": f"News snippet {i} about: {query[:80]}",
+            "url": f"https://news.example/{self._rng.randint(1, 10**6)}",
+        } for i in range(max_results)]}
+
+# --- GOOGLE SHEETS (gspread) ---
+
+class FakeWorksheet:
+    def __init__(self, service, headers, rows):
+        self._service = service
+        self.headers = headers
+        self.rows = [[row.get(h, "") for h in headers] for row in rows]
+
+    def row_values(self, idx):
+        self._service.call()
+        return list(self.headers) if idx == 1 else list(self.rows[idx - 2])
+
+    def get_all_records(self):
+        self._service.call()
+        return [dict(zip(self.headers, row)) for row in self.rows]
+
+    def update_cell(self, row, col, value):
+        self._service.call()
+        self.rows[row - 2][col - 1] = value
+
+class FakeSheetsClient:
+    """Sostituto di gspread.Client: open_by_url(...).get_worksheet(0)."""
+
+    def __init__(self, profile, metrics, headers, rows, seed=0):
+        service = _FakeService("sheets", profile, metrics, seed)
+        self.worksheet = FakeWorksheet(service, headers, rows)
+
+    def open_by_url(self, url):
+        return SimpleNamespace(get_worksheet=lambda idx: self.worksheet)
@@ -0,0 +1,175 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, ROOT)
+
+import process_data
+from output_sinks import write_geojson
+from nan_sanitizer import dump_json
+from fix_nan import process_json_file
+from synthetic_events import generate_rows, write_csv
+
+# ==========================================
+# ⏱️ BENCHMARK DELLA PIPELINE DATI
+# ==========================================
+# Uso:
+#   python benchmarks/run_benchmarks.py                          # tutte le taglie
+#   python benchmarks/run_benchmarks.py --sizes 1000 10000       # solo alcune
+#   python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+REGRESSION_THRESHOLD = 1.2 # +20% di tempo rispetto alla baseline = regressione
+
+COL_MAP = {'desc': 'description', 'title': 'title', 'loc': 'location'}
+
+def measure(fn, items, memory=True):
+    """Esegue fn una volta per il tempo e (opzionale) una volta sotto tracemalloc per il picco RAM."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+
+        peak_mb = None
+        if memory:
+            tracemalloc.start()
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+    return {
+        "seconds": round(elapsed, 4),
+        "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+        "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+    }
+
+def _features(rows):
+    features = []
+    for row in rows:
+        lat = process_data.safe_float(row['latitude'])
+        lon = process_data.safe_float(row['longitude'])
+        if lat is None or lon is None:
+            continue
+        props = {k: v for k, v in row.items() if k not in ('latitude', 'longitude')}
+        props['intensity'] = process_data.safe_float(row['intensity'])
+        props['actor_code'] = process_data.classify_actor(row, COL_MAP)
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": props
+        })
+    return features
+
+def run_size(n, workdir, memory=True):
+    csv_path = write_csv(os.path.join(workdir, f"events_{n}.csv"), n)
+    rows = [{k.lower(): v for k, v in row.items()} for row in generate_rows(n)]
+    coords = [row['latitude'] for row in rows] + [row['longitude'] for row in rows]
+    features = _features(rows)
+    # Documento con NaN "veri" come quelli prodotti da pandas
+    nan_doc = {"type": "FeatureCollection", "features": [
+        {**f, "properties": {**f['properties'], "intensity": f['properties']['intensity'] or float('nan')}}
+        for f in features
+    ]}
+    out_dir = os.path.join(workdir, f"out_{n}")
+    os.makedirs(out_dir, exist_ok=True)
+    # File con NaN letterali, come quelli che fix_nan.py deve ripulire
+    dirty_path = os.path.join(out_dir, "dirty.geojson")
+    with open(dirty_path, 'w', encoding='utf-8') as f:
+        json.dump(nan_doc, f, ensure_ascii=False, indent=2)
+    fix_path = os.path.join(out_dir, "fix_nan.geojson")
+
+    def fix_nan_file():
+        shutil.copyfile(dirty_path, fix_path) # Ogni giro riparte dal file sporco
+        process_json_file(fix_path)
+
+    def dump_nan_doc():
+        with open(os.path.join(out_dir, "nan.geojson"), 'w', encoding='utf-8') as f:
+            dump_json(nan_doc, f, ensure_ascii=False, indent=2)
+
+    benches = {
+        "process_data.main": (lambda: process_data.main(source=csv_path, out_dir=out_dir), n),
+        "classify_actor": (lambda: [process_data.classify_actor(r, COL_MAP) for r in rows], n),
+        "safe_float": (lambda: [process_data.safe_float(v) for v in coords], len(coords)),
+        "dump_json_nan": (dump_nan_doc, len(features)),
+        "fix_nan_file": (fix_nan_file, len(features)),
+        "write_geojson": (lambda: write_geojson(features, os.path.join(out_dir, "bench.geojson")), len(features)),
+    }
+
+    results = {}
+    for name, (fn, items) in benches.items():
+        results[name] = measure(fn, items, memory)
+        r = results[name]
+        mem = f", picco {r['peak_mb']} MB" if r['peak_mb'] is not None else ""
+        print(f"   {name:<20} {r['seconds']:>9.3f}s  {r['items_per_sec']:>12,.0f} item/s{mem}")
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def compare(current, baseline_path):
+    """Confronta con una baseline salvata. Restituisce il numero di regressioni."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\n=== CONFRONTO con {baseline_path} (commit {baseline.get('commit')}) ===")
+    regressions = 0
+    for size, benches in current['results'].items():
+        for name, r in benches.items():
+            old = baseline.get('results', {}).get(size, {}).get(name)
+            if not old or not old.get('seconds'):
+                continue
+            ratio = r['seconds'] / old['seconds']
+            flag = "⚠️ REGRESSIONE" if ratio > REGRESSION_THRESHOLD else ""
+            if flag: regressions += 1
+            print(f"   {size:>8} {name:<20} x{ratio:.2f} {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della pipeline dati OSINT")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--output', help="File JSON dei risultati (default: baseline.json se non si confronta)")
+    parser.add_argument('--compare', help="Baseline JSON con cui confrontare")
+    parser.add_argument('--no-memory', action='store_true', help="Salta la misura del picco RAM")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            print(f"\n📏 {n:,} righe")
+            report['results'][str(n)] = run_size(n, workdir, memory=not args.no_memory)
+
+    regressions = compare(report, args.compare) if args.compare else 0
+
+    # In modalità confronto la baseline non viene sovrascritta, salvo --output esplicito
+    output = args.output or (None if args.compare else DEFAULT_OUTPUT)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Risultati salvati in {output}")
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import csv
+import random
+import sys
+
+# ==========================================
+# 🧪 GENERATORE DI EVENTI SINTETICI
+# ==========================================
+# Imita lo schema reale dello Sheet: intestazioni miste, coordinate con virgola
+# (IT) o punto (US), formati data diversi, testi IT/EN con armi e località.
+
+HEADERS = [
+    "Title", "Date", "Type", "Location", "Latitude", "Longitude",
+    "Source", "Verification", "Description", "Video", "Intensity"
+]
+
+PLACES = [
+    ("Kharkiv", 49.9935, 36.2304), ("Kyiv", 50.4501, 30.5234), ("Odesa", 46.4825, 30.7233),
+    ("Dnipro", 48.4647, 35.0462), ("Zaporizhzhia", 47.8388, 35.1396), ("Sumy", 50.9077, 34.7981),
+    ("Belgorod", 50.5997, 36.5983), ("Kursk", 51.7304, 36.1926), ("Sevastopol", 44.6166, 33.5254),
+    ("Novorossiysk", 44.7239, 37.7708), ("Bryansk", 53.2521, 34.3717), ("Pokrovsk", 48.2820, 37.1758),
+]
+WEAPONS_RU = ["Shahed", "Geran-2", "Iskander", "Kalibr", "Kh-101", "FAB-500", "S-300"]
+WEAPONS_UA = ["HIMARS", "ATACMS", "Storm Shadow", "Neptune", "Magura", "Sea Baby"]
+TYPES = ["Drone Strike", "Missile Strike", "Artillery", "Airstrike", "Naval Strike",
+         "Energy Infrastructure", "Sabotage", "Unknown", ""]
+TEMPLATES_IT = [
+    "Attacco con {w} contro infrastrutture energetiche a {p}",
+    "Forze russe colpiscono {p} con {w}, danni a edifici civili",
+    "Le forze ucraine hanno colpito un deposito a {p} con {w}",
+    "Esplosioni segnalate a {p}, possibile impiego di {w}",
+]
+TEMPLATES_EN = [
+    "{w} strike on power substation in {p}",
+    "Russian forces hit residential area of {p} with {w}",
+    "Ukrainian {w} attack on ammunition depot near {p}",
+    "Explosions reported in {p}, debris from intercepted {w}",
+]
+
+def _coord(value, rng):
+    # ~40% formato italiano con la virgola, qualche cella vuota o sporca
+    r = rng.random()
+    if r < 0.02:
+        return ""
+    if r < 0.03:
+        return "nan"
+    text = f"{value:.6f}"
+    return text.replace('.', ',') if r < 0.42 else text
+
+def _date(rng):
+    y, m, d = rng.choice([2024, 2025]), rng.randint(1, 12), rng.randint(1, 28)
+    fmt = rng.random()
+    if fmt < 0.5:
+        return f"{d:02d}/{m:02d}/{y % 100:02d}"
+    if fmt < 0.8:
+        return f"{y}-{m:02d}-{d:02d}"
+    return f"{d}/{m}/{y}"
+
+def generate_row(rng):
+    place, lat, lon = rng.choice(PLACES)
+    weapon = rng.choice(WEAPONS_RU + WEAPONS_UA)
+    template = rng.choice(TEMPLATES_IT if rng.random() < 0.6 else TEMPLATES_EN)
+    title = template.format(w=weapon, p=place)
+    lat += rng.uniform(-0.3, 0.3)
+    lon += rng.uniform(-0.3, 0.3)
+    intensity = rng.choice(["", "0.2", "0,5", "0.8", "1"])
+    return {
+        "Title": title,
+        "Date": _date(rng),
+        "Type": rng.choice(TYPES),
+        "Location": f"{place}, regione di {place}" if rng.random() < 0.7 else place,
+        "Latitude": _coord(lat, rng),
+        "Longitude": _coord(lon, rng),
+        "Source": f"https://t.me/example/{rng.randint(1, 10**7)}" if rng.random() < 0.8 else "",
+        "Verification": rng.choice(["verified", "not verified", "Verified", ""]),
+        "Description": " ".join([title] * rng.randint(1, 4)),
+        "Video": "https://www.youtube.com/watch?v=xyz" if rng.random() < 0.1 else "",
+        "Intensity": intensity,
+    }
+
+def generate_rows(n, seed=42):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield generate_row(rng)
+
+def write_csv(path, n, seed=42):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
+        writer.writeheader()
+        writer.writerows(generate_rows(n, seed))
+    return path
+
+if __name__ == "__main__":
+    # Es: python benchmarks/synthetic_events.py 10000 /tmp/events.csv
+    write_csv(sys.argv[2], int(sys.argv[1]))
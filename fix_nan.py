@@ -1,33 +1,107 @@
 import json
 import os
-import math
-
-def fix_nan_in_value(value):
-    if isinstance(value, float) and math.isnan(value):
-        return None
-    elif isinstance(value, str) and value.lower() in ['nan', 'NaN']:
-        return None
-    elif isinstance(value, dict):
-        return {k: fix_nan_in_value(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [fix_nan_in_value(item) for item in value]
-    return value
-
-def process_json_file(filepath):
+import sys
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from nan_sanitizer import NanSanitizer
+
+# Hash dei file già puliti: se il contenuto non cambia, il file non viene ri-analizzato.
+# Il file è versionato (lo committa fix_nan.yml) così vale anche sui checkout nuovi della CI.
+CACHE_FILE = '.fix_nan_cache.json'
+CHUNK_SIZE = 1 << 16
+SKIP_DIRS = ['.git', 'node_modules', '__pycache__']
+
+def _read_chunks(filepath):
+    # newline='': niente traduzione CRLF, così il testo riencodato coincide
+    # byte per byte col file e l'hash è confrontabile con file_digest()
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def _sanitize(filepath, out=None):
+    """Passa il file nel sanitizer a pezzi. Restituisce (sostituzioni, sha256 dell'output)."""
+    sanitizer = NanSanitizer()
+    digest = hashlib.sha256()
+    for chunk in _read_chunks(filepath):
+        cleaned = sanitizer.feed(chunk)
+        digest.update(cleaned.encode('utf-8'))
+        if out: out.write(cleaned)
+    cleaned = sanitizer.close()
+    digest.update(cleaned.encode('utf-8'))
+    if out: out.write(cleaned)
+    return sanitizer.replaced, digest.hexdigest()
+
+def file_digest(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def process_json_file(filepath, known_digest=None):
+    """
+    Pulisce un file JSON/GeoJSON in streaming.
+    Salta il file se l'hash coincide con l'ultima passata pulita e lo riscrive
+    solo se conteneva davvero NaN/Infinity.
+    Restituisce (filepath, stato, hash) con stato in 'skip', 'clean', 'fixed', 'error'.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        cleaned_data = fix_nan_in_value(data)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
-        print(f"✓ {filepath}")
-        return True
+        if known_digest and file_digest(filepath) == known_digest:
+            return filepath, 'skip', known_digest
+
+        replaced, digest = _sanitize(filepath)
+        if not replaced:
+            print(f"✓ {filepath}")
+            return filepath, 'clean', digest
+
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            replaced, digest = _sanitize(filepath, out)
+        os.replace(tmp_path, filepath)
+        print(f"✓ {filepath} ({replaced} NaN sostituiti)")
+        return filepath, 'fixed', digest
     except Exception as e:
         print(f"✗ {filepath}: {e}")
-        return False
+        return filepath, 'error', None
+
+def iter_json_files(root='.'):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if filename.endswith(('.json', '.geojson')) and filename != CACHE_FILE:
+                yield os.path.normpath(os.path.join(dirpath, filename))
+
+def load_cache():
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def main(root='.', workers=None):
+    cache = load_cache()
+    files = list(iter_json_files(root))
+    stats = {'skip': 0, 'clean': 0, 'fixed': 0, 'error': 0}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(process_json_file, files, [cache.get(p) for p in files])
+        for filepath, status, digest in results:
+            stats[status] += 1
+            if digest:
+                cache[filepath] = digest
+            else:
+                cache.pop(filepath, None)
+
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+    print(f"📊 {stats}")
+    return stats
 
-for dirpath, dirnames, filenames in os.walk('.'):
-    dirnames[:] = [d for d in dirnames if d not in ['.git', 'node_modules', '__pycache__']]
-    for filename in filenames:
-        if filename.endswith(('.json', '.geojson')):
-            process_json_file(os.path.join(dirpath, filename))
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else '.')
@@ -0,0 +1,187 @@
+import math
+import re
+from datetime import date
+from difflib import SequenceMatcher
+
+# --- CONFIGURAZIONE ---
+DEDUP_DISTANCE_KM = 5.0     # Raggio entro cui due eventi sono candidati duplicati
+DEDUP_WINDOW_DAYS = 1       # Finestra temporale (+/- giorni)
+DEDUP_MIN_SIMILARITY = 0.8  # Similarità minima tra i titoli per unire (il luogo lo copre già la distanza)
+UNKNOWN_VALUES = ('', 'unk', 'unknown', 'general', 'none', 'null')
+
+KM_PER_DEG = 111.32
+
+def parse_day(date_str):
+    """
+    Converte la data dell'evento in un numero di giorno (ordinale).
+    Gestisce: YYYY-MM-DD, DD/MM/YY, DD/MM/YYYY. Restituisce None se illeggibile.
+    """
+    s = str(date_str or "").strip()
+    try:
+        m = re.match(r'^(\d{4})-(\d{1,2})-(\d{1,2})', s)
+        if m:
+            y, mo, d = m.groups()
+            return date(int(y), int(mo), int(d)).toordinal()
+        m = re.match(r'^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})', s)
+        if m:
+            d, mo, y = m.groups()
+            if len(y) == 2: y = "20" + y
+            return date(int(y), int(mo), int(d)).toordinal()
+    except ValueError:
+        return None
+    return None
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distanza in km tra due punti (lat/lon in gradi)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0 * math.asin(min(1.0, math.sqrt(a)))
+
+def _norm(value):
+    return re.sub(r'[^\w]+', ' ', str(value or "").lower()).strip()
+
+def _type_key(props):
+    """Famiglia del tipo: prima parola normalizzata ('Drone Strike' e 'drone' -> 'drone')."""
+    words = _norm(props.get('type')).split()
+    return words[0] if words and words[0] not in UNKNOWN_VALUES else None
+
+def _actor_key(props):
+    actor = _norm(props.get('actor_code'))
+    return actor if actor not in UNKNOWN_VALUES else None
+
+def _norm_text(props):
+    """
+    Titolo normalizzato, senza il prefisso di categoria (es. ACLED:
+    "Battles - Armed clash" -> "armed clash"), che altrimenti renderebbe
+    simili tutti gli eventi dello stesso tipo.
+    """
+    title = _norm(props.get('title'))
+    prefix = _norm(props.get('type'))
+    if prefix and title.startswith(prefix + ' '):
+        title = title[len(prefix) + 1:]
+    return title
+
+def compatible(a, b):
+    """Tipo e attore devono coincidere quando entrambi sono noti."""
+    for key in (_type_key, _actor_key):
+        ka, kb = key(a), key(b)
+        if ka and kb and ka != kb:
+            return False
+    return True
+
+def _coords(feat):
+    """(lat, lon) numerici, o None per coordinate illeggibili o per il segnaposto [0, 0] dell'agente."""
+    try:
+        lon, lat = (float(c) for c in feat['geometry']['coordinates'][:2])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if math.isnan(lat) or math.isnan(lon) or (lat == 0 and lon == 0):
+        return None
+    return lat, lon
+
+def text_similarity(a, b):
+    """Similarità 0-1 tra due testi già normalizzati."""
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+def record_score(props):
+    """
+    Punteggio di 'qualità' di un record: verificato > non verificato,
+    poi presenza di fonte/video, poi descrizione più ricca.
+    """
+    verified = 1 if str(props.get('verification') or "").lower() == 'verified' else 0
+    has_link = 1 if record_link(props) else 0
+    has_video = 1 if props.get('video') not in (None, "", "null") else 0 # L'agente scrive "null"
+    return (verified, has_link + has_video, len(str(props.get('description') or "")))
+
+def record_link(props):
+    """Fonte del record: 'link' per il foglio, 'source_url' per gli eventi dell'agente."""
+    return str(props.get('link') or props.get('source_url') or "").strip()
+
+def dedup_features(features, distance_km=DEDUP_DISTANCE_KM, window_days=DEDUP_WINDOW_DAYS,
+                   min_similarity=DEDUP_MIN_SIMILARITY):
+    """
+    Raggruppa i duplicati spazio-temporali con un indice a griglia (cella x giorno).
+    Ogni feature viene confrontata solo con le celle vicine nella finestra temporale,
+    quindi il costo è quasi lineare invece che quadratico.
+    Un record si unisce al capofila (primo record) di un cluster vicino nello
+    spazio e nel tempo, con tipo/attore compatibili e il titolo più simile.
+    Record senza data o senza coordinate valide (o al segnaposto [0, 0]) restano da soli.
+    Restituisce (lista_features_deduplicate, numero_duplicati_rimossi).
+    """
+    cell_deg = distance_km / KM_PER_DEG
+    index = {}      # (cella_lat, cella_lon, giorno) -> [indici dei record "capofila"]
+    cluster_of = [] # indice feature -> id cluster
+    clusters = []   # id cluster -> [indici feature]
+    texts, points = [], []
+
+    for i, feat in enumerate(features):
+        props = feat['properties']
+        point = _coords(feat)
+        day = parse_day(props.get('date'))
+        text = _norm_text(props)
+        texts.append(text)
+        points.append(point)
+
+        best, best_sim = None, min_similarity
+        if day is not None and point is not None:
+            lat, lon = point
+            ci, cj = int(math.floor(lat / cell_deg)), int(math.floor(lon / cell_deg))
+            # In longitudine i gradi si "stringono" con la latitudine: allarghiamo la ricerca
+            span_j = int(math.ceil(1 / max(math.cos(math.radians(lat)), 0.05)))
+            for di in (-1, 0, 1):
+                for dj in range(-span_j, span_j + 1):
+                    for dd in range(-window_days, window_days + 1):
+                        # Solo i capofila sono nell'indice: si confronta col primo record
+                        # del cluster, così i cluster non si allungano a catena nel tempo
+                        for j in index.get((ci + di, cj + dj, day + dd), ()):
+                            o_lat, o_lon = points[j]
+                            if haversine_km(lat, lon, o_lat, o_lon) > distance_km:
+                                continue
+                            if not compatible(props, features[j]['properties']):
+                                continue
+                            sim = text_similarity(text, texts[j])
+                            if sim >= best_sim:
+                                best, best_sim = j, sim
+            if best is None:
+                index.setdefault((ci, cj, day), []).append(i)
+
+        if best is None:
+            cluster_of.append(len(clusters))
+            clusters.append([i])
+        else:
+            cid = cluster_of[best]
+            cluster_of.append(cid)
+            clusters[cid].append(i)
+
+    result = []
+    for members in clusters:
+        if len(members) == 1:
+            result.append(features[members[0]])
+            continue
+        keep = max(members, key=lambda k: record_score(features[k]['properties']))
+        merged = dict(features[keep])
+        props = dict(merged['properties'])
+        # Un membro può essere già il risultato di un'unione precedente (es. il
+        # GeoJSON ri-deduplicato dall'agente): si sommano fonti, conteggi e ID.
+        sources, original_ids, merged_count = [], [], 0
+        for k in members:
+            m_props = features[k]['properties']
+            for link in m_props.get('sources') or [record_link(m_props)]:
+                if link and link not in sources:
+                    sources.append(link)
+            for oid in m_props.get('original_ids') or [m_props.get('original_id')]:
+                if oid and oid not in original_ids:
+                    original_ids.append(oid)
+            merged_count += m_props.get('merged_count') or 1
+        props['sources'] = sources
+        props['merged_count'] = merged_count
+        if original_ids:
+            props['original_ids'] = original_ids # ID dell'agente da non ri-analizzare
+        merged['properties'] = props
+        result.append(merged)
+
+    return result, len(features) - len(result)
@@ -0,0 +1,92 @@
+import json
+import re
+
+# ==========================================
+# 🧹 SANITIZER JSON IN STREAMING
+# ==========================================
+# Sostituisce con `null` i token NaN / Infinity / -Infinity e le stringhe "nan"
+# usate come valore, lavorando a pezzi: non serve mai tenere in memoria
+# l'intero documento e la formattazione originale resta intatta.
+# fix_nan.py lo usa sui file esistenti, i writer tramite dump_json().
+
+# Basta trovare stringhe (per sapere cosa è dentro/fuori dalle virgolette) e
+# costanti non valide: tutto il resto viene copiato così com'è.
+_SCAN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|-?Infinity|NaN')
+_NEXT_CHAR = re.compile(r'\s*(\S)')
+_BAD_CONSTANTS = ('NaN', 'Infinity', '-Infinity')
+_LOOKAHEAD = len('-Infinity')
+_BATCH_CHUNKS = 8192
+
+class NanSanitizer:
+    """
+    Trasformatore incrementale: feed(testo) restituisce il testo pulito
+    disponibile finora, close() svuota il buffer residuo.
+    `replaced` conta i valori sostituiti con null.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self.replaced = 0
+
+    def feed(self, text):
+        self._buf += text
+        return self._process(final=False)
+
+    def close(self):
+        return self._process(final=True)
+
+    def _process(self, final):
+        buf = self._buf
+        limit = len(buf) if final else len(buf) - _LOOKAHEAD
+        out = []
+        pos = 0  # fine dell'ultimo testo già emesso
+        cut = None
+        for m in _SCAN.finditer(buf):
+            # Un token che tocca la coda del buffer potrebbe continuare nel pezzo successivo
+            if not final and m.end() >= limit:
+                cut = m.start()
+                break
+            tok = m.group()
+            if tok in _BAD_CONSTANTS:
+                replacement = "null"
+            elif tok.lower() == '"nan"':
+                # Stringa "nan": è una chiave se seguita da ':', altrimenti un valore
+                nxt = _NEXT_CHAR.match(buf, m.end())
+                if nxt is None and not final:
+                    cut = m.start()
+                    break
+                if nxt is not None and nxt.group(1) == ':':
+                    continue
+                replacement = "null"
+            else:
+                continue
+            out.append(buf[pos:m.start()])
+            out.append(replacement)
+            self.replaced += 1
+            pos = m.end()
+
+        if cut is None:
+            # Dopo l'ultimo token non ci sono virgolette: si trattiene solo la coda
+            cut = len(buf) if final else max(pos, limit)
+        out.append(buf[pos:cut])
+        self._buf = buf[cut:]
+        return "".join(out)
+
+def dump_json(data, fp, **kwargs):
+    """
+    Hook di validazione per i writer: come json.dump (stessi kwargs), ma
+    NaN/Infinity e le stringhe "nan" diventano null prima di arrivare su disco.
+    Restituisce il numero di valori sostituiti.
+    """
+    sanitizer = NanSanitizer()
+    # iterencode produce pezzi minuscoli: li accorpiamo per non fare un write per token
+    batch = []
+    for chunk in json.JSONEncoder(**kwargs).iterencode(data):
+        batch.append(chunk)
+        if len(batch) >= _BATCH_CHUNKS:
+            fp.write(sanitizer.feed("".join(batch)))
+            batch = []
+    fp.write(sanitizer.feed("".join(batch)) + sanitizer.close())
+    if sanitizer.replaced:
+        print(f"   🧹 {sanitizer.replaced} valori NaN/Infinity sostituiti con null")
+    return sanitizer.replaced
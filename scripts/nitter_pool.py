@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+
+# ==========================================
+# 🐦 POOL DI ISTANZE NITTER
+# ==========================================
+# Tiene statistiche persistenti (latenza ed errori, medie mobili) per ogni
+# istanza, instrada ogni account sull'istanza sana più veloce e in caso di
+# errore riprova su un'altra. Se i dati di salute sono recenti, salta il
+# lento probe di tutte le istanze che ntscraper fa all'avvio.
+
+NITTER_HEALTH_FILE = '.nitter_health.json'
+HEALTH_TTL_S = 12 * 3600     # Dopo questo tempo dall'ultimo probe si ri-testano tutte le istanze
+EWMA_ALPHA = 0.3             # Peso dell'ultima misura nelle medie mobili
+DEFAULT_LATENCY_MS = 3000.0  # Stima per istanze mai misurate
+COOLDOWN_AFTER_FAILURES = 3  # Fallimenti consecutivi prima di mettere l'istanza a riposo
+COOLDOWN_S = 30 * 60
+MAX_ATTEMPTS = 3             # Istanze diverse provate per ogni account
+EMPTY_CONFIRMATIONS = 2      # Istanze affidabili che devono tornare vuote per dire "account senza tweet"
+TRUSTED_FOR_S = 6 * 3600     # Un'istanza è affidabile se ha restituito tweet entro questo tempo
+
+class NitterPool:
+    def __init__(self, nitter_cls, health_file=None, log_level=1):
+        self.health_file = health_file = health_file or NITTER_HEALTH_FILE
+        self.stats = {}
+        self.probed_at = 0
+        self._lock = threading.Lock() # Il daemon usa il pool da più thread
+        if os.path.exists(health_file):
+            try:
+                with open(health_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                self.stats = cached.get('instances', {})
+                self.probed_at = cached.get('probed_at', 0)
+            except (OSError, ValueError):
+                self.stats = {}
+
+        fresh = time.time() - self.probed_at < HEALTH_TTL_S and self.healthy_instances()
+        if fresh:
+            print(f"   ♻️ Cache salute Nitter recente: {len(self.healthy_instances())} istanze, probe saltato")
+        else:
+            print("   🔎 Cache salute Nitter assente o scaduta: probe delle istanze...")
+            probe = nitter_cls(log_level=log_level, skip_instance_check=False)
+            working = probe.working_instances or probe.instances
+            self.stats = {url: self.stats.get(url) or self._new_stats() for url in working}
+            self.probed_at = time.time()
+
+        # I retry li gestisce il pool: ntscraper non deve cambiare istanza da solo
+        self.scraper = nitter_cls(instances=list(self.stats), log_level=log_level, skip_instance_check=True)
+
+    @staticmethod
+    def _new_stats():
+        return {"latency_ms": None, "error_rate": 0.0, "failures": 0, "cooldown_until": 0, "calls": 0,
+                "last_tweets_at": 0}
+
+    def _score(self, url):
+        s = self.stats[url]
+        latency = s['latency_ms'] if s['latency_ms'] is not None else DEFAULT_LATENCY_MS
+        return latency * (1 + 4 * s['error_rate'])
+
+    def healthy_instances(self):
+        """Istanze non a riposo, dalla più veloce alla più lenta."""
+        now = time.time()
+        healthy = [url for url, s in self.stats.items() if s['cooldown_until'] <= now]
+        return sorted(healthy, key=self._score)
+
+    def _record(self, url, latency_ms, ok):
+        with self._lock:
+            s = self.stats[url]
+            s['calls'] += 1
+            s['error_rate'] = (1 - EWMA_ALPHA) * s['error_rate'] + EWMA_ALPHA * (0.0 if ok else 1.0)
+            if ok:
+                s['failures'] = 0
+                s['last_tweets_at'] = time.time()
+                s['latency_ms'] = latency_ms if s['latency_ms'] is None else \
+                    (1 - EWMA_ALPHA) * s['latency_ms'] + EWMA_ALPHA * latency_ms
+            else:
+                s['failures'] += 1
+                if s['failures'] >= COOLDOWN_AFTER_FAILURES:
+                    s['cooldown_until'] = time.time() + COOLDOWN_S
+
+    def _trusted(self, url):
+        """L'istanza ha restituito tweet di recente: un suo risultato vuoto è credibile."""
+        return time.time() - self.stats[url].get('last_tweets_at', 0) < TRUSTED_FOR_S
+
+    def get_tweets(self, user, number=3, attempts=MAX_ATTEMPTS):
+        """
+        Scarica gli ultimi tweet di `user` dall'istanza migliore, passando alla
+        successiva se fallisce o torna vuota. ntscraper non solleva eccezioni
+        quando un'istanza è giù o limitata: restituisce {"tweets": []}. Per questo
+        un risultato vuoto è un fallimento, a meno che l'istanza sia affidabile
+        (ha restituito tweet di recente per qualche account). Se EMPTY_CONFIRMATIONS
+        istanze affidabili tornano vuote l'account è fermo: si restituisce il
+        risultato vuoto senza registrarlo come successo. Solleva l'ultimo errore
+        se nessuna istanza risponde.
+        """
+        last_error = None
+        empty = [] # (url, latenza) delle istanze affidabili tornate vuote
+        for url in self.healthy_instances()[:attempts]:
+            t0 = time.perf_counter()
+            try:
+                result = self.scraper.get_tweets(user, mode='user', number=number, instance=url, max_retries=1)
+            except Exception as e:
+                self._record(url, (time.perf_counter() - t0) * 1000, False)
+                last_error = e
+                continue
+            latency_ms = (time.perf_counter() - t0) * 1000
+
+            if result and result.get('tweets'):
+                self._record(url, latency_ms, True)
+                for other, other_ms in empty: # Erano vuote ma i tweet c'erano
+                    self._record(other, other_ms, False)
+                return result
+
+            if not self._trusted(url):
+                # Pagina di errore o rate limit travestiti da account vuoto
+                self._record(url, latency_ms, False)
+                last_error = ValueError(f"nessun tweet da {url}")
+                continue
+            empty.append((url, latency_ms))
+            if len(empty) >= EMPTY_CONFIRMATIONS:
+                break
+
+        if empty:
+            return {"tweets": [], "threads": []}
+        raise last_error or ValueError("nessuna istanza Nitter disponibile")
+
+    def save(self):
+        with self._lock, open(self.health_file, 'w', encoding='utf-8') as f:
+            json.dump({"probed_at": self.probed_at, "instances": self.stats}, f, indent=2)
@@ -2,10 +2,14 @@ import asyncio
 import json
 import os
 import random
+import time
 from datetime import datetime
 from telethon import TelegramClient
 from ntscraper import Nitter
 from openai import OpenAI
+from dedup_events import dedup_features
+from output_sinks import write_geojson
+from nitter_pool import NitterPool
 
 # ==========================================
 # ⚙️ CONFIGURAZIONE UTENTE (SECURE MODE)
@@ -133,6 +137,50 @@ def analyze_with_ai(text, source, platform, media_url=None):
 # 🕵️ GLI SCRAPER
 # ==========================================
 
+async def fetch_telegram_channel(client, channel, existing_ids, out, limit=4, min_id=0, ai_failures=None):
+    """
+    Legge i messaggi di un canale con id > min_id, li analizza e accoda i nuovi
+    eventi in `out`: l'ID entra in existing_ids solo quando l'evento è in coda,
+    e se iter_messages si interrompe gli eventi già accodati restano in `out`.
+    Restituisce il nuovo cursore: l'id più alto sotto cui ogni messaggio è stato
+    gestito. Un messaggio su cui l'AI fallisce tiene fermo il cursore e viene
+    riletto al giro dopo (al massimo AI_MAX_RETRIES volte, contate in `ai_failures`).
+    """
+    last_id = min_id
+    oldest_failed = None
+    async for message in client.iter_messages(channel, limit=limit, min_id=min_id):
+        last_id = max(last_id, message.id)
+        if not message.text or len(message.text) < 50: continue
+        
+        # ID univoco per evitare duplicati
+        unique_id = f"tg_{channel}_{message.id}"
+        if unique_id in existing_ids: continue
+        
+        # Recupera eventuale immagine (complesso su TG, per ora passiamo None)
+        # In futuro possiamo scaricare il media, caricarlo su un server e passare l'URL
+        
+        # La chiamata OpenAI è bloccante: in un thread non ferma gli altri canali
+        ai_result = await asyncio.to_thread(analyze_with_ai, message.text, channel, "Telegram", None)
+        
+        if ai_result:
+            ai_result['original_id'] = unique_id
+            ai_result['source_url'] = f"[https://t.me/](https://t.me/){channel}/{message.id}"
+            out.append(ai_result)
+            existing_ids.add(unique_id) # Aggiungi al set temporaneo
+            if ai_failures is not None: ai_failures.pop(unique_id, None)
+            continue
+
+        tries = 1
+        if ai_failures is not None:
+            tries = ai_failures[unique_id] = ai_failures.get(unique_id, 0) + 1
+        if tries < AI_MAX_RETRIES:
+            oldest_failed = message.id if oldest_failed is None else min(oldest_failed, message.id)
+        else:
+            print(f"   ⚠️ {unique_id}: AI fallita {tries} volte, messaggio saltato")
+    if oldest_failed is not None:
+        return max(min_id, oldest_failed - 1)
+    return last_id
+
 async def scrape_telegram(existing_ids):
     new_events = []
     print("\n📡 Connessione a Telegram...")
@@ -142,106 +190,90 @@ async def scrape_telegram(existing_ids):
             print(f"   ↳ Scansiono @{channel}...")
             try:
                 # Prende solo gli ultimi 3 messaggi per non finire i crediti subito
-                async for message in client.iter_messages(channel, limit=4):
-                    if not message.text or len(message.text) < 50: continue
-                    
-                    # ID univoco per evitare duplicati
-                    unique_id = f"tg_{channel}_{message.id}"
-                    if unique_id in existing_ids: continue
-                    
-                    # Recupera eventuale immagine (complesso su TG, per ora passiamo None)
-                    # In futuro possiamo scaricare il media, caricarlo su un server e passare l'URL
-                    
-                    ai_result = analyze_with_ai(message.text, channel, "Telegram", None)
-                    
-                    if ai_result:
-                        ai_result['original_id'] = unique_id
-                        ai_result['source_url'] = f"[https://t.me/](https://t.me/){channel}/{message.id}"
-                        new_events.append(ai_result)
-                        existing_ids.add(unique_id) # Aggiungi al set temporaneo
-
+                await fetch_telegram_channel(client, channel, existing_ids, new_events, limit=4)
             except Exception as e:
                 print(f"   ⚠️ Errore su {channel}: {e}")
     
     return new_events
 
+def fetch_twitter_account(pool, user, existing_ids, out, number=3):
+    """
+    Scarica gli ultimi tweet di un account (con failover sulle istanze), li
+    analizza e accoda i nuovi eventi in `out` (che restano anche se si interrompe).
+    """
+    tweets = pool.get_tweets(user, number=number)
+    
+    for tweet in tweets['tweets']:
+        text = tweet['text']
+        if len(text) < 50: continue
+        
+        # ID univoco
+        tid = tweet['link'].split('/')[-1] if 'link' in tweet else str(random.randint(1000,9999))
+        unique_id = f"tw_{user}_{tid}"
+        
+        if unique_id in existing_ids: continue
+        
+        # Estrazione Immagine dal tweet (se c'è)
+        img_url = None
+        if tweet['pictures']:
+            img_url = tweet['pictures'][0]
+        
+        ai_result = analyze_with_ai(text, user, "X", img_url)
+        
+        if ai_result:
+            ai_result['original_id'] = unique_id
+            ai_result['source_url'] = tweet['link']
+            out.append(ai_result)
+            existing_ids.add(unique_id)
+
 def scrape_twitter(existing_ids):
     new_events = []
-    scraper = Nitter(log_level=1, skip_instance_check=False) # Usa istanze casuali
     print("\n🐦 Connessione a X (via Nitter)...")
+    t0 = time.perf_counter()
+    pool = NitterPool(Nitter) # Istanze ordinate per latenza, probe solo se la cache è vecchia
+    covered = 0
 
     for user in TWITTER_ACCOUNTS:
         print(f"   ↳ Scansiono @{user}...")
         try:
-            # Prende gli ultimi 3 tweet
-            tweets = scraper.get_tweets(user, mode='user', number=3)
-            
-            for tweet in tweets['tweets']:
-                text = tweet['text']
-                if len(text) < 50: continue
-                
-                # ID univoco
-                tid = tweet['link'].split('/')[-1] if 'link' in tweet else str(random.randint(1000,9999))
-                unique_id = f"tw_{user}_{tid}"
-                
-                if unique_id in existing_ids: continue
-                
-                # Estrazione Immagine dal tweet (se c'è)
-                img_url = None
-                if tweet['pictures']:
-                    img_url = tweet['pictures'][0]
-                
-                ai_result = analyze_with_ai(text, user, "X", img_url)
-                
-                if ai_result:
-                    ai_result['original_id'] = unique_id
-                    ai_result['source_url'] = tweet['link']
-                    new_events.append(ai_result)
-                    existing_ids.add(unique_id)
-
+            # Prende gli ultimi 3 tweet (con failover su altre istanze)
+            fetch_twitter_account(pool, user, existing_ids, new_events, number=3)
+            covered += 1
         except Exception as e:
-            print(f"   ⚠️ Errore su {user} (Rate limit o Nitter down): {e}")
-            
+            print(f"   ⚠️ Errore su {user} (tutte le istanze Nitter provate): {e}")
+
+    pool.save()
+    print(f"   📊 Account coperti: {covered}/{len(TWITTER_ACCOUNTS)} in {time.perf_counter() - t0:.1f}s")
     return new_events
 
 # ==========================================
-# 🚀 MAIN LOOP
+# 💾 DATABASE
 # ==========================================
 
-async def main():
-    print("=== 🌍 IMPACT ATLAS OSINT AGENT AVVIATO ===")
-    
-    # 1. Carica DB esistente
+def load_database():
+    """Carica il GeoJSON esistente e il set di ID già presenti (per non duplicare)."""
     if os.path.exists(DATA_FILE):
         with open(DATA_FILE, 'r', encoding='utf-8') as f:
             geojson = json.load(f)
-            # Crea un set di ID già presenti per non duplicare
-            existing_ids = set()
-            for feat in geojson['features']:
-                if 'original_id' in feat['properties']:
-                    existing_ids.add(feat['properties']['original_id'])
-            print(f"📂 Database caricato: {len(geojson['features'])} eventi esistenti.")
+        existing_ids = set()
+        for feat in geojson['features']:
+            if 'original_id' in feat['properties']:
+                existing_ids.add(feat['properties']['original_id'])
+            # Eventi dell'agente uniti a un duplicato: l'ID resta nel record tenuto
+            existing_ids.update(feat['properties'].get('original_ids') or [])
+        print(f"📂 Database caricato: {len(geojson['features'])} eventi esistenti.")
     else:
         geojson = {"type": "FeatureCollection", "features": []}
         existing_ids = set()
+    return geojson, existing_ids
 
-    # 2. Esegui Scraping
-    # Telegram (Async)
-    tg_data = await scrape_telegram(existing_ids)
-    
-    # Twitter (Sync - Nitter è bloccante)
-    tw_data = scrape_twitter(existing_ids)
-    
-    all_new_data = tg_data + tw_data
-    
-    if not all_new_data:
-        print("\n💤 Nessun nuovo evento rilevato.")
-        return
-
-    # 3. Converti in GeoJSON Features e Salva
-    print(f"\n💾 Salvataggio di {len(all_new_data)} nuovi eventi...")
-    
-    for item in all_new_data:
+def save_events(geojson, new_data):
+    """
+    Converte gli eventi AI in Feature, li aggiunge al GeoJSON, unisce i
+    duplicati (stesso attacco già nel foglio o visto da un'altra sorgente)
+    e riscrive il file.
+    """
+    for item in new_data:
         # Pulizia item per metterlo in properties
         props = item.copy()
         lat = props.pop('lat')
@@ -257,15 +289,161 @@ async def main():
         }
         geojson['features'].append(feature)
 
-    # Scrittura su file
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(geojson, f, indent=2, ensure_ascii=False)
+    geojson['features'], duplicates = dedup_features(geojson['features'])
+    if duplicates:
+        print(f"🔗 Duplicati uniti: {duplicates}")
+
+    # Scrittura su file (con la coppia compatta letta dalla mappa)
+    write_geojson(geojson['features'], DATA_FILE)
+
+# ==========================================
+# 🚀 MAIN LOOP
+# ==========================================
+
+async def main():
+    print("=== 🌍 IMPACT ATLAS OSINT AGENT AVVIATO ===")
+    
+    # 1. Carica DB esistente
+    geojson, existing_ids = load_database()
+
+    # 2. Esegui Scraping
+    # Telegram (Async)
+    tg_data = await scrape_telegram(existing_ids)
+    
+    # Twitter (Sync - Nitter è bloccante)
+    tw_data = scrape_twitter(existing_ids)
+    
+    all_new_data = tg_data + tw_data
+    
+    if not all_new_data:
+        print("\n💤 Nessun nuovo evento rilevato.")
+        return
+
+    # 3. Converti in GeoJSON Features e Salva
+    print(f"\n💾 Salvataggio di {len(all_new_data)} nuovi eventi...")
+    save_events(geojson, all_new_data)
 
     print("✅ AGGIORNAMENTO COMPLETATO CON SUCCESSO.")
 
+# ==========================================
+# 🔁 DAEMON MODE
+# ==========================================
+# Processo residente: client Telegram, pool Nitter e client OpenAI restano
+# aperti, ogni sorgente ha il suo intervallo di polling (dimezzato quando
+# trova novità, allungato quando è ferma), le sorgenti scadute sono
+# interrogate in parallelo e i nuovi eventi vengono salvati a piccoli lotti.
+# Gli ID già visti non passano mai dall'AI e ogni giro legge al massimo
+# DAEMON_TELEGRAM_LIMIT messaggi per canale, quindi anche la spesa resta limitata.
+
+DAEMON_MIN_INTERVAL_S = 120       # Sorgenti molto attive: al massimo ogni 2 minuti
+DAEMON_MAX_INTERVAL_S = 3600      # Sorgenti ferme: almeno una volta l'ora
+DAEMON_START_INTERVAL_S = 600
+DAEMON_BACKOFF = 1.5              # Moltiplicatore dell'intervallo se non c'è nulla di nuovo
+DAEMON_TELEGRAM_LIMIT = 20        # Messaggi letti (e analizzati) per canale a ogni giro: l'arretrato oltre viene saltato
+DAEMON_CONCURRENCY = 4            # Sorgenti interrogate in parallelo
+AI_MAX_RETRIES = 3                # Tentativi AI per messaggio prima di superarlo col cursore
+FLUSH_INTERVAL_S = 60             # Micro-batch: salva almeno ogni minuto...
+FLUSH_BATCH = 10                  # ...o appena ci sono 10 eventi in coda
+
+def reschedule(source, found, now):
+    """Intervallo adattivo: più frequente se la sorgente ha prodotto eventi, più rado se no."""
+    if found:
+        source['interval'] = max(DAEMON_MIN_INTERVAL_S, source['interval'] / 2)
+    else:
+        source['interval'] = min(DAEMON_MAX_INTERVAL_S, source['interval'] * DAEMON_BACKOFF)
+    source['next_due'] = now + source['interval']
+
+async def run_daemon(max_runtime_s=None):
+    """Polling continuo fino a max_runtime_s (None = per sempre). Restituisce lo stato delle sorgenti."""
+    print("=== 🔁 IMPACT ATLAS OSINT AGENT (DAEMON) ===")
+    geojson, existing_ids = load_database()
+    pool = await asyncio.to_thread(NitterPool, Nitter)
+
+    # Prima scansione distribuita sul primo intervallo, per non partire tutti insieme
+    names = [('Telegram', c) for c in TELEGRAM_CHANNELS] + [('X', u) for u in TWITTER_ACCOUNTS]
+    start = time.monotonic()
+    sources = [{
+        'platform': platform, 'name': name, 'interval': DAEMON_START_INTERVAL_S,
+        'next_due': start + i * DAEMON_START_INTERVAL_S / max(len(names), 1), 'last_id': 0,
+        'ai_failures': {},
+    } for i, (platform, name) in enumerate(names)]
+
+    pending = []
+    last_flush = start
+    semaphore = asyncio.Semaphore(DAEMON_CONCURRENCY)
+    in_flight = {} # task -> sorgente
+
+    async def flush():
+        # Dedup e riscrittura dei file sono lente: in un thread, mentre i poll proseguono
+        nonlocal pending, last_flush
+        batch, pending = pending, []
+        last_flush = time.monotonic()
+        if batch:
+            print(f"💾 Micro-batch: {len(batch)} nuovi eventi")
+            await asyncio.to_thread(save_events, geojson, batch)
+        await asyncio.to_thread(pool.save)
+
+    async def poll(client, source):
+        found = []
+        async with semaphore:
+            try:
+                if source['platform'] == 'Telegram':
+                    source['last_id'] = await fetch_telegram_channel(
+                        client, source['name'], existing_ids, found, limit=DAEMON_TELEGRAM_LIMIT,
+                        min_id=source['last_id'], ai_failures=source['ai_failures'])
+                else:
+                    # Nitter e OpenAI sono bloccanti: in un thread, mentre le altre sorgenti avanzano
+                    await asyncio.to_thread(fetch_twitter_account, pool, source['name'], existing_ids, found)
+            except Exception as e:
+                print(f"   ⚠️ Errore su {source['name']}: {e}")
+            finally:
+                pending.extend(found) # Anche gli eventi analizzati prima dell'errore
+        reschedule(source, bool(found), time.monotonic())
+
+    async with TelegramClient('osint_session', TELEGRAM_API_ID, TELEGRAM_API_HASH) as client:
+        try:
+            while max_runtime_s is None or time.monotonic() - start < max_runtime_s:
+                # Le sorgenti scadute partono come task: un poll lento non blocca gli altri né i salvataggi
+                now = time.monotonic()
+                busy = set(map(id, in_flight.values()))
+                for source in sorted(sources, key=lambda s: s['next_due']):
+                    if source['next_due'] <= now and id(source) not in busy:
+                        in_flight[asyncio.create_task(poll(client, source))] = source
+
+                if len(pending) >= FLUSH_BATCH or time.monotonic() - last_flush >= FLUSH_INTERVAL_S:
+                    await flush()
+
+                busy = set(map(id, in_flight.values()))
+                idle = [s['next_due'] for s in sources if id(s) not in busy]
+                next_due = min(idle) if idle else time.monotonic() + FLUSH_INTERVAL_S
+                wait = min(next_due, last_flush + FLUSH_INTERVAL_S) - time.monotonic()
+                if max_runtime_s is not None:
+                    wait = min(wait, start + max_runtime_s - time.monotonic())
+                wait = max(wait, 0.05)
+                if in_flight:
+                    # Si risveglia anche quando un poll finisce (evento in coda o sorgente da riprogrammare)
+                    done, _ = await asyncio.wait(in_flight, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        del in_flight[task]
+                else:
+                    await asyncio.sleep(wait)
+        finally:
+            # I poll ancora in corso allo stop vengono annullati: quello che hanno già trovato finisce in coda
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await flush()
+    return sources
+
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Impact Atlas OSINT agent")
+    parser.add_argument('--daemon', action='store_true', help="Processo residente con polling adattivo")
+    parser.add_argument('--max-runtime', type=float, help="Secondi dopo cui il daemon si ferma")
+    args = parser.parse_args()
+
     # Fix per loop asyncio su alcuni sistemi
     import nest_asyncio
     nest_asyncio.apply()
     
-    asyncio.run(main())
+    asyncio.run(run_daemon(args.max_runtime) if args.daemon else main())
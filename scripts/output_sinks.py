@@ -0,0 +1,226 @@
+import csv
+import hashlib
+import os
+import re
+
+from nan_sanitizer import dump_json
+
+# ==========================================
+# 📤 OUTPUT SINKS
+# ==========================================
+# Ogni sink riceve la stessa lista di feature normalizzate (già deduplicate)
+# prodotte da process_data.py e scrive UN file. Per aggiungere un formato
+# basta decorare una funzione con @register_sink("nome", "percorso/output").
+# I sink con default=False girano solo se richiesti per nome.
+
+SINKS = {}
+DEFAULT_SINKS = []
+
+def register_sink(name, path, default=True):
+    """Registra un writer: fn(features, path) -> numero di record scritti."""
+    def decorator(fn):
+        SINKS[name] = (path, fn)
+        if default:
+            DEFAULT_SINKS.append(name)
+        return fn
+    return decorator
+
+def _ensure_dir(path):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+def timeline_date(date_str):
+    """
+    Parsing data approssimativo per la timeline: (anno, mese, giorno).
+    Cerca pattern YYYY-MM-DD o DD/MM/YYYY. Solleva ValueError se la data è invalida.
+    """
+    y, m, d = "2024", "01", "01"
+    if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
+        y, m, d = date_str.split('-')
+    elif re.match(r'\d{1,2}/\d{1,2}/\d{2,4}', date_str):
+        parts = date_str.split('/')
+        d, m, y = parts[0], parts[1], parts[2]
+        if len(y) == 2: y = "20" + y
+    return int(y), int(m), int(d)
+
+@register_sink("geojson", "assets/data/events.geojson")
+def write_geojson(features, path):
+    """
+    Scrive il GeoJSON completo e, accanto, la coppia compatta (events.compact.json
+    + events.details.json): la mappa legge prima quella, quindi non deve mai
+    restare indietro rispetto al file completo.
+    """
+    _ensure_dir(path)
+    with open(path, "w", encoding="utf-8") as f:
+        dump_json({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False, indent=2)
+    write_geojson_compact(features, compact_path(path))
+    return len(features)
+
+@register_sink("timeline_json", "assets/data/events_timeline.json")
+def write_timeline_json(features, path):
+    tl_events = []
+    for feat in features:
+        props = feat['properties']
+        try:
+            y, m, d = timeline_date(props['date'])
+        except ValueError:
+            continue # Se data invalida, niente timeline ma mappa ok
+
+        tl_obj = {
+            "start_date": {"year": y, "month": m, "day": d},
+            "text": {
+                "headline": props['title'],
+                "text": f"<b>Tipo:</b> {props['type']}<br><b>Attore:</b> {props['actor_code']}<br><b>Luogo:</b> {props['location']}<br><br>{props['description']}"
+            },
+            "group": props['type']
+        }
+        if props['video']:
+            tl_obj["media"] = {"url": props['video'], "caption": "Fonte Video"}
+        tl_events.append(tl_obj)
+
+    _ensure_dir(path)
+    with open(path, "w", encoding="utf-8") as f:
+        dump_json({"title": {"text": {"headline": "Timeline"}}, "events": tl_events}, f, ensure_ascii=False, indent=2)
+    return len(tl_events)
+
+# Schema storico di events_timeline.csv (compresa la colonna senza nome del foglio)
+TIMELINE_CSV_FIELDS = [
+    "title", "date", "type", "location", "latitude", "longitude",
+    "source", "archived", "verification", "", "notes"
+]
+
+@register_sink("timeline_csv", "assets/data/events_timeline.csv")
+def write_timeline_csv(features, path):
+    _ensure_dir(path)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TIMELINE_CSV_FIELDS)
+        writer.writeheader()
+        for feat in features:
+            props = feat['properties']
+            lon, lat = feat['geometry']['coordinates'][:2]
+            writer.writerow({
+                "title": props['title'],
+                "date": props['date'],
+                "type": props['type'],
+                "location": props['location'],
+                "latitude": lat,
+                "longitude": lon,
+                "source": props['link'],
+                "archived": props.get('archived', ""),
+                "verification": props['verification'],
+                "": "",
+                "notes": props.get('notes', ""),
+            })
+    return len(features)
+
+# ==========================================
+# 🗜️ GEOJSON COMPATTO
+# ==========================================
+# Profilo per il percorso critico della mappa, scritto sempre insieme al
+# GeoJSON completo dal sink "geojson":
+# - coordinate quantizzate a COMPACT_PRECISION decimali, come interi in delta;
+# - campi categorici sostituiti da indici in una tabella condivisa ("dict");
+# - proprietà come array posizionali (i nomi dei campi compaiono una sola volta);
+# - descrizioni lunghe spostate in events.details.json, scaricato solo
+#   quando si apre il dettaglio di un evento (chiave = id della feature).
+# Il formato è decodificato da decodeCompactEvents() in assets/js/map.js.
+
+COMPACT_VERSION = 1
+COMPACT_PRECISION = 5        # 5 decimali ≈ 1 metro
+COMPACT_DICT_FIELDS = ('date', 'type', 'verification', 'actor_code')
+COMPACT_INLINE_DESC = 80     # Descrizioni più lunghe finiscono nel file di dettaglio
+
+def feature_id(feat):
+    """ID stabile tra un build e l'altro (non dipende dall'ordine delle feature)."""
+    props = feat['properties']
+    lon, lat = feat['geometry']['coordinates'][:2]
+    key = f"{props.get('date')}|{props.get('title')}|{lon:.{COMPACT_PRECISION}f}|{lat:.{COMPACT_PRECISION}f}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+
+def encode_compact(features, precision=COMPACT_PRECISION, dict_fields=COMPACT_DICT_FIELDS,
+                   inline_desc=COMPACT_INLINE_DESC):
+    """Restituisce (documento_compatto, dettagli_per_id)."""
+    fields = []
+    for feat in features:
+        for key in feat['properties']:
+            if key not in fields:
+                fields.append(key)
+
+    scale = 10 ** precision
+    lookup = {f: {} for f in dict_fields if f in fields}
+    ids, coords, rows, details = [], [], [], {}
+    prev_lon = prev_lat = 0
+    seen_ids = set()
+    for feat in features:
+        fid = base_id = feature_id(feat)
+        n = 1
+        while fid in seen_ids: # Record identici (es. duplicati non ancora uniti)
+            fid, n = f"{base_id}-{n}", n + 1
+        seen_ids.add(fid)
+        props = feat['properties']
+        lon, lat = feat['geometry']['coordinates'][:2]
+        q_lon, q_lat = round(lon * scale), round(lat * scale)
+        coords.extend([q_lon - prev_lon, q_lat - prev_lat])
+        prev_lon, prev_lat = q_lon, q_lat
+
+        row = []
+        for key in fields:
+            value = props.get(key)
+            if key in lookup:
+                value = lookup[key].setdefault(value, len(lookup[key]))
+            elif key == 'description' and value and len(value) > inline_desc:
+                details[fid] = {"description": value}
+                value = None # null = nel file di dettaglio
+            row.append(value)
+        ids.append(fid)
+        rows.append(row)
+
+    doc = {
+        "v": COMPACT_VERSION,
+        "precision": precision,
+        "fields": fields,
+        "dict": {f: list(values) for f, values in lookup.items()},
+        "ids": ids,
+        "coords": coords,
+        "props": rows,
+    }
+    return doc, details
+
+def decode_compact(doc, details=None):
+    """Inverso di encode_compact: ricostruisce la FeatureCollection (coordinate quantizzate)."""
+    scale = 10 ** doc['precision']
+    fields, lookup = doc['fields'], doc['dict']
+    features = []
+    lon = lat = 0
+    for i, (fid, row) in enumerate(zip(doc['ids'], doc['props'])):
+        lon += doc['coords'][2 * i]
+        lat += doc['coords'][2 * i + 1]
+        props = {}
+        for key, value in zip(fields, row):
+            if key in lookup:
+                value = lookup[key][value]
+            elif key == 'description' and value is None and details and fid in details:
+                value = details[fid]['description']
+            props[key] = value
+        props['id'] = fid
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon / scale, lat / scale]},
+            "properties": props
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+def compact_path(geojson_path):
+    """events.geojson -> events.compact.json (i dettagli vanno in events.details.json)."""
+    return os.path.splitext(geojson_path)[0] + '.compact.json'
+
+def write_geojson_compact(features, path):
+    doc, details = encode_compact(features)
+    details_path = path.replace('.compact.json', '.details.json')
+    _ensure_dir(path)
+    with open(path, "w", encoding="utf-8") as f:
+        dump_json(doc, f, ensure_ascii=False, separators=(',', ':'))
+    with open(details_path, "w", encoding="utf-8") as f:
+        dump_json(details, f, ensure_ascii=False, separators=(',', ':'))
+    return len(features)
@@ -1,5 +1,4 @@
 import pandas as pd
-import json
 import sys
 import numpy as np
 import requests
@@ -7,11 +6,13 @@ import io
 import re
 import math
 import os
+import time
+
+from dedup_events import dedup_features
+from output_sinks import SINKS, DEFAULT_SINKS
 
 # --- CONFIGURAZIONE ---
 SHEET_URL = "https://docs.google.com/spreadsheets/d/1NEyNXzCSprGOw6gCmVVbtwvFmz8160Oag-WqG93ouoQ/export?format=csv"
-OUTPUT_GEOJSON = "assets/data/events.geojson"
-OUTPUT_TIMELINE = "assets/data/events_timeline.json"
 
 def get_col(df, candidates):
     """Trova la colonna corretta tra le varianti possibili."""
@@ -75,15 +76,31 @@ def classify_actor(row, col_map):
 
     return 'UNK'
 
-def main():
+def main(sinks=None, source=SHEET_URL, out_dir=None):
+    """
+    Build unico: scarica il foglio UNA volta, normalizza UNA volta e
+    passa le feature ai sink di default di output_sinks (o solo a `sinks`).
+    `source` può essere anche un CSV locale, `out_dir` sposta tutti gli output
+    (usati dai benchmark per non toccare assets/data).
+    """
     print("🏭 AVVIO PROCESSAMENTO DATI (V. POLYGLOT)...")
 
+    unknown = [name for name in (sinks or []) if name not in SINKS]
+    if unknown:
+        print(f"❌ Sink sconosciuti: {', '.join(unknown)}. Disponibili: {', '.join(SINKS)}")
+        sys.exit(1)
+
     # 1. SCARICAMENTO
     try:
         print(f"⬇️ Scaricamento CSV...")
-        response = requests.get(SHEET_URL)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text))
+        t0 = time.perf_counter()
+        if source.startswith(("http://", "https://")):
+            response = requests.get(source)
+            response.raise_for_status()
+            df = pd.read_csv(io.StringIO(response.text))
+        else:
+            df = pd.read_csv(source)
+        print(f"   ↳ {len(df)} righe in {time.perf_counter() - t0:.2f}s")
     except Exception as e:
         print(f"❌ Errore critico download: {e}")
         sys.exit(1)
@@ -107,7 +124,10 @@ def main():
         'link': get_col(df, ['source', 'link', 'fonte']),
         'video': get_col(df, ['video', 'video_url']),
         'ver': get_col(df, ['verification', 'verifica']),
-        'int': get_col(df, ['intensity', 'intensità'])
+        'int': get_col(df, ['intensity', 'intensità']),
+        # Solo per events_timeline.csv (schema storico)
+        'archived': get_col(df, ['archived', 'archiviato', 'archive']),
+        'notes': get_col(df, ['notes', 'note'])
     }
 
     if not col_map['lat'] or not col_map['lon']:
@@ -116,8 +136,6 @@ def main():
 
     # 4. ELABORAZIONE
     features = []
-    tl_events = []
-    stats = {'RUS': 0, 'UKR': 0, 'UNK': 0}
     skipped = 0
 
     for index, row in df.iterrows():
@@ -131,7 +149,6 @@ def main():
 
         # CLASSIFICAZIONE
         actor_code = classify_actor(row, col_map)
-        stats[actor_code] += 1
 
         # Recupero Dati
         title = str(row[col_map['title']]).strip() or "Evento"
@@ -159,6 +176,9 @@ def main():
             "intensity": intensity,
             "actor_code": actor_code # <--- CRUCIALE
         }
+        for key in ('archived', 'notes'):
+            if col_map[key] and col_map[key] != col_map['desc']:
+                props[key] = str(row[col_map[key]]).strip()
 
         features.append({
             "type": "Feature",
@@ -166,46 +186,34 @@ def main():
             "properties": props
         })
 
-        # COSTRUZIONE TIMELINE
-        # (Parsing data approssimativo per evitare crash)
-        try:
-            y, m, d = "2024", "01", "01"
-            # Cerca pattern YYYY-MM-DD o DD/MM/YYYY
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                y, m, d = date_str.split('-')
-            elif re.match(r'\d{1,2}/\d{1,2}/\d{2,4}', date_str):
-                parts = date_str.split('/')
-                d, m, y = parts[0], parts[1], parts[2]
-                if len(y) == 2: y = "20" + y
-            
-            tl_obj = {
-                "start_date": {"year": int(y), "month": int(m), "day": int(d)},
-                "text": { 
-                    "headline": title, 
-                    "text": f"<b>Tipo:</b> {type_str}<br><b>Attore:</b> {actor_code}<br><b>Luogo:</b> {loc_str}<br><br>{desc}" 
-                },
-                "group": type_str
-            }
-            if video_str:
-                tl_obj["media"] = {"url": video_str, "caption": "Fonte Video"}
-            tl_events.append(tl_obj)
-        except:
-            pass # Se data invalida, niente timeline ma mappa ok
-
-    # 5. OUTPUT
-    os.makedirs(os.path.dirname(OUTPUT_GEOJSON), exist_ok=True)
-
-    with open(OUTPUT_GEOJSON, "w", encoding="utf-8") as f:
-        json.dump({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False, indent=2)
-    
-    with open(OUTPUT_TIMELINE, "w", encoding="utf-8") as f:
-        json.dump({"title": {"text": {"headline": "Timeline"}}, "events": tl_events}, f, ensure_ascii=False, indent=2)
+    # 5. DEDUPLICAZIONE (stesso attacco riportato da più righe del foglio;
+    #    gli eventi dell'agente sono deduplicati da osint_agent.save_events)
+    features, duplicates = dedup_features(features)
+
+    # Statistiche sugli eventi effettivamente scritti
+    stats = {'RUS': 0, 'UKR': 0, 'UNK': 0}
+    for feat in features:
+        stats[feat['properties']['actor_code']] += 1
+
+    # 6. OUTPUT: stesse feature in memoria -> tutti i sink registrati
+    timings = {}
+    for name in (sinks or DEFAULT_SINKS):
+        path, writer = SINKS[name]
+        if out_dir:
+            path = os.path.join(out_dir, os.path.basename(path))
+        t0 = time.perf_counter()
+        count = writer(features, path)
+        timings[name] = (path, count, time.perf_counter() - t0)
 
     print("\n=== REPORT ===")
     print(f"✅ Eventi Generati: {len(features)}")
     print(f"❌ Righe Saltate (No Lat/Lon): {skipped}")
+    print(f"🔗 Duplicati Uniti: {duplicates}")
     print(f"📊 Classificazione: {stats}")
+    for name, (path, count, elapsed) in timings.items():
+        print(f"💾 {name}: {count} record -> {path} ({elapsed:.2f}s)")
     print("==============")
 
 if __name__ == "__main__":
-    main()
+    # Es: python scripts/process_data.py geojson timeline_json
+    main(sys.argv[1:] or None)
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from dedup_events import DEDUP_WINDOW_DAYS, dedup_features
+
+def feature(lon, lat, **props):
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]}, "properties": props}
+
+def sheet_row(title, type_, date, lon=30.5234, lat=50.4501, location="Kyiv, Europe, Ukraine", link=""):
+    # Righe come quelle prodotte da process_data.py (import ACLED nel foglio)
+    return feature(lon, lat, title=title, date=date, type=type_, location=location, link=link,
+                   verification="not verified", description="", video="", intensity=0.2, actor_code="RUS")
+
+def test_distinct_same_day_categories_survive():
+    rows = [
+        sheet_row("Battles - Armed clash", "Battles", "26/03/22"),
+        sheet_row("Battles - Government regains territory", "Battles", "26/03/22"),
+        sheet_row("Battles - Non-state actor overtakes territory", "Battles", "26/03/22"),
+        sheet_row("Explosions/Remote violence - Air/drone strike", "Explosions/Remote violence", "26/03/22"),
+        sheet_row("Explosions/Remote violence - Shelling/artillery/missile attack", "Explosions/Remote violence", "26/03/22"),
+        sheet_row("Protests - Excessive force against protesters", "Protests", "26/03/22"),
+        sheet_row("Strategic developments - Looting/property destruction", "Strategic developments", "26/03/22"),
+        sheet_row("Violence against civilians - Abduction/forced disappearance", "Violence against civilians", "26/03/22"),
+        sheet_row("Violence against civilians - Sexual violence", "Violence against civilians", "26/03/22"),
+        sheet_row("Attacco di artiglieria contro civili a Kherson", "Artillery", "27/05/22",
+                  lon=32.6169, lat=46.6354, location="Kherson, Europe, Ukraine"),
+        sheet_row("Attacco con droni contro infrastrutture a Kherson", "Drone Strike", "27/05/22",
+                  lon=32.6169, lat=46.6354, location="Kherson, Europe, Ukraine"),
+    ]
+    result, removed = dedup_features(rows)
+    assert removed == 0
+    assert len(result) == len(rows)
+
+def test_repost_is_merged_with_sources():
+    a = sheet_row("Attacco con droni alla raffineria di Saratov", "Drone Strike", "2025-08-02",
+                  lon=46.03, lat=51.53, location="Saratov", link="https://a.example")
+    b = sheet_row("Attacco di droni alla raffineria di Saratov", "Drone Strike", "03/08/25",
+                  lon=46.05, lat=51.54, location="Saratov, Russia", link="https://b.example")
+    result, removed = dedup_features([a, b])
+    assert removed == 1
+    assert result[0]['properties']['merged_count'] == 2
+    assert result[0]['properties']['sources'] == ["https://a.example", "https://b.example"]
+
+def test_clusters_do_not_chain_across_days():
+    rows = [sheet_row("Bombardamento di artiglieria su Kherson", "Artillery", f"2025-03-{day:02d}",
+                      lon=32.6169, lat=46.6354, location="Kherson") for day in range(1, 11)]
+    result, _ = dedup_features(rows)
+    assert all((f['properties'].get('merged_count') or 1) <= 2 * DEDUP_WINDOW_DAYS + 1 for f in result)
+    assert len(result) >= len(rows) // (2 * DEDUP_WINDOW_DAYS + 1)
+
+def test_unknown_location_placeholder_is_not_merged():
+    events = [feature(0, 0, title="Attacco segnalato", date="2025-08-02", type="drone", actor_code="RUS",
+                      original_id=f"tg_chan_{i}", source_url=f"https://t.me/chan/{i}") for i in range(3)]
+    result, removed = dedup_features(events)
+    assert removed == 0
+    assert len(result) == 3
+
+def test_non_numeric_coordinates_do_not_crash():
+    as_text = feature('37.8', '48.0', title="Attacco", date="2025-08-02", type="drone")
+    unreadable = feature('n/a', '', title="Attacco", date="2025-08-02", type="drone")
+    ok = feature(37.8, 48.0, title="Attacco", date="2025-08-02", type="drone")
+    result, removed = dedup_features([unreadable, as_text, ok])
+    assert removed == 1 # Le coordinate testuali valide sono confrontate come numeri
+    assert result[0] is unreadable